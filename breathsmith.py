@@ -4,16 +4,49 @@ Breathsmith MCP Server
 Personal collection of useful tools and utilities
 """
 import asyncio
-import json
+import hashlib
+import importlib.util
+import inspect
+import io
 import os
+import shlex
+import shutil
 import sqlite3
 import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache, partial, wraps
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
+import httpx
+import orjson
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+
+def _lazy_import(name: str):
+    """Import a module on first attribute access, or return None if it is not installed.
+    
+    The LLM SDKs take ~300ms to import, which would otherwise be paid on every
+    server start even in sessions that never call an LLM tool.
+    """
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# LLM provider SDKs are optional - tools report a helpful error if missing
+openai = _lazy_import("openai")
+anthropic = _lazy_import("anthropic")
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +54,127 @@ load_dotenv()
 # Create the main server instance
 mcp = FastMCP("Breathsmith")
 
+# Claude Desktop log location (macOS)
+CLAUDE_LOG_DIR = Path.home() / "Library" / "Logs" / "Claude"
+
+@lru_cache(maxsize=1)
+def _http_client():
+    """Shared HTTP connection pool for all LLM provider clients."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+
+@lru_cache(maxsize=1)
+def _openai():
+    """Lazily create the OpenAI client, reused across tool calls."""
+    return openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=_http_client())
+
+@lru_cache(maxsize=1)
+def _anthropic():
+    """Lazily create the Anthropic client, reused across tool calls."""
+    return anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=_http_client())
+
+def _first_text(response) -> Optional[str]:
+    """Extract the text of the last message in a Responses API result."""
+    for item in reversed(getattr(response, "output", None) or ()):
+        for content_item in getattr(item, "content", None) or ():
+            text = getattr(content_item, "text", None)
+            if text is not None:
+                return text
+    return None
+
+async def _report_delta(ctx: Optional[Context], chunks: List[str]) -> None:
+    """Forward the newest streamed text chunk to the client as a progress notification."""
+    if ctx is not None:
+        await ctx.report_progress(progress=len(chunks), message=chunks[-1])
+
+async def _gather_limited(coros, concurrency: int = 20) -> list:
+    """Await coroutines concurrently, at most `concurrency` in flight, preserving order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run(coro):
+        async with semaphore:
+            return await coro
+    
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+# Response cache for LLM tools, keyed by tool name and call arguments
+LLM_CACHE_PATH = Path(os.getenv("BREATHSMITH_CACHE_DB", Path(__file__).with_name("llm_cache.db")))
+_llm_cache_stats = {"hits": 0, "misses": 0}
+_llm_cache_conn: Optional[sqlite3.Connection] = None
+
+def _llm_cache_connect() -> sqlite3.Connection:
+    """Return the shared cache connection, opening it and creating the table on first use.
+    
+    Use it as `with _llm_cache_connect() as conn:` - that only scopes a
+    transaction, the connection stays open for later calls.
+    """
+    global _llm_cache_conn
+    
+    if _llm_cache_conn is None:
+        conn = sqlite3.connect(str(LLM_CACHE_PATH), check_same_thread=False)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        _llm_cache_conn = conn
+    return _llm_cache_conn
+
+def _llm_cached(ttl: int):
+    """Cache successful responses of an async LLM tool for ttl seconds.
+    
+    Error and empty-response messages are never stored, so a failed call
+    is retried next time.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = hashlib.sha256(orjson.dumps([fn.__name__, bound.arguments])).hexdigest()
+            
+            try:
+                with _llm_cache_connect() as conn:
+                    row = conn.execute(
+                        "SELECT response FROM llm_cache WHERE key = ? AND ts > ?",
+                        (key, int(time.time()) - ttl)
+                    ).fetchone()
+            except sqlite3.Error:
+                row = None
+            
+            if row:
+                _llm_cache_stats["hits"] += 1
+                return row[0]
+            _llm_cache_stats["misses"] += 1
+            
+            response = await fn(*args, **kwargs)
+            
+            if not response.startswith(("Error", "No response received")):
+                try:
+                    with _llm_cache_connect() as conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO llm_cache (key, response, ts) VALUES (?, ?, ?)",
+                            (key, response, int(time.time()))
+                        )
+                except sqlite3.Error:
+                    pass
+            
+            return response
+        
+        return wrapper
+    
+    return decorator
+
+# Timestamp formatters for get_timestamp, keyed by format_type
+_TIMESTAMP_FORMATTERS = {
+    "unix": lambda: str(int(time.time())),
+    "iso": lambda: datetime.now().isoformat(),
+    "readable": lambda: time.strftime("%Y-%m-%d %H:%M:%S"),
+}
+
 @mcp.tool()
 def get_timestamp(format_type: str = "iso") -> str:
     """Get current timestamp in various formats.
@@ -31,14 +185,8 @@ def get_timestamp(format_type: str = "iso") -> str:
     Returns:
         Formatted timestamp string
     """
-    now = datetime.now()
-    
-    if format_type == "unix":
-        return str(int(now.timestamp()))
-    elif format_type == "readable":
-        return now.strftime("%Y-%m-%d %H:%M:%S")
-    else:  # iso
-        return now.isoformat()
+    # Unknown formats fall back to iso
+    return _TIMESTAMP_FORMATTERS.get(format_type, _TIMESTAMP_FORMATTERS["iso"])()
 
 @mcp.tool()
 def test_tool(message: str = "Hello") -> str:
@@ -53,7 +201,8 @@ def test_tool(message: str = "Hello") -> str:
     return f"Echo: {message} at {datetime.now().strftime('%H:%M:%S')}"
 
 @mcp.tool()
-def openai_chat(prompt: str, model: str = "gpt-4.1-mini", max_tokens: int = 500) -> str:
+@_llm_cached(ttl=7 * 24 * 3600)
+async def openai_chat(prompt: str, model: str = "gpt-4.1-mini", max_tokens: int = 500) -> str:
     """Send a prompt to OpenAI using the modern Responses API.
     
     Args:
@@ -64,36 +213,31 @@ def openai_chat(prompt: str, model: str = "gpt-4.1-mini", max_tokens: int = 500)
     Returns:
         The AI response as a string
     """
+    if openai is None:
+        return "Error: OpenAI library not installed. Run 'uv add openai' to install."
+    
     try:
-        # Import here to avoid issues if not installed
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        if not client.api_key:
+        if not os.getenv("OPENAI_API_KEY"):
             return "Error: OPENAI_API_KEY not found in environment variables"
         
+        client = _openai()
+        
         # Try the modern Responses API first
         try:
-            response = client.responses.create(
+            response = await client.responses.create(
                 model=model,
                 input=prompt
             )
             
-            # Extract text from the response output
-            if response.output and len(response.output) > 0:
-                # Find the last message in the output
-                for item in reversed(response.output):
-                    if hasattr(item, 'content') and item.content:
-                        for content_item in item.content:
-                            if hasattr(content_item, 'text'):
-                                return content_item.text
+            text = _first_text(response)
+            if text is not None:
+                return text
             
             return "No response received from Responses API"
             
         except Exception as responses_error:
             # Fallback to Chat Completions API
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=model,
                 messages=[
                     {"role": "user", "content": prompt}
@@ -103,13 +247,48 @@ def openai_chat(prompt: str, model: str = "gpt-4.1-mini", max_tokens: int = 500)
             
             return response.choices[0].message.content or "No response received"
         
-    except ImportError:
+    except Exception as e:
+        return f"Error calling OpenAI API: {str(e)}"
+
+@mcp.tool()
+async def openai_chat_stream(prompt: str, model: str = "gpt-4.1-mini", max_tokens: int = 500, ctx: Optional[Context] = None) -> str:
+    """Send a prompt to OpenAI, streaming the reply as it is generated.
+    
+    Text deltas are sent as progress notifications while the model is still
+    writing, so clients that show progress see output within the first second.
+    
+    Args:
+        prompt: The message/question to send to OpenAI
+        model: The OpenAI model to use (default: gpt-4.1-mini)
+        max_tokens: Maximum tokens in response (default: 500)
+        
+    Returns:
+        The complete AI response as a string
+    """
+    if openai is None:
         return "Error: OpenAI library not installed. Run 'uv add openai' to install."
+    
+    try:
+        if not os.getenv("OPENAI_API_KEY"):
+            return "Error: OPENAI_API_KEY not found in environment variables"
+        
+        client = _openai()
+        
+        chunks = []
+        async with client.responses.stream(model=model, input=prompt, max_output_tokens=max_tokens) as stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    chunks.append(event.delta)
+                    await _report_delta(ctx, chunks)
+        
+        return "".join(chunks) or "No response received"
+        
     except Exception as e:
         return f"Error calling OpenAI API: {str(e)}"
 
 @mcp.tool()
-def claude_chat(prompt: str, model: str = "claude-sonnet-4-20250514", max_tokens: int = 1000) -> str:
+@_llm_cached(ttl=7 * 24 * 3600)
+async def claude_chat(prompt: str, model: str = "claude-sonnet-4-20250514", max_tokens: int = 1000) -> str:
     """Send a prompt to Claude (Anthropic) and get a response.
     
     Args:
@@ -120,16 +299,16 @@ def claude_chat(prompt: str, model: str = "claude-sonnet-4-20250514", max_tokens
     Returns:
         Claude's response as a string
     """
+    if anthropic is None:
+        return "Error: Anthropic library not installed. Run 'uv add anthropic' to install."
+    
     try:
-        # Import here to avoid issues if not installed
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        
         if not os.getenv("ANTHROPIC_API_KEY"):
             return "Error: ANTHROPIC_API_KEY not found in environment variables"
         
-        response = client.messages.create(
+        client = _anthropic()
+        
+        response = await client.messages.create(
             model=model,
             max_tokens=max_tokens,
             messages=[
@@ -139,13 +318,52 @@ def claude_chat(prompt: str, model: str = "claude-sonnet-4-20250514", max_tokens
         
         return response.content[0].text if response.content else "No response received"
         
-    except ImportError:
+    except Exception as e:
+        return f"Error calling Claude API: {str(e)}"
+
+@mcp.tool()
+async def claude_chat_stream(prompt: str, model: str = "claude-sonnet-4-20250514", max_tokens: int = 1000, ctx: Optional[Context] = None) -> str:
+    """Send a prompt to Claude (Anthropic), streaming the reply as it is generated.
+    
+    Text deltas are sent as progress notifications while the model is still
+    writing, so clients that show progress see output within the first second.
+    
+    Args:
+        prompt: The message/question to send to Claude
+        model: The Claude model to use (default: claude-sonnet-4-20250514)
+        max_tokens: Maximum tokens in response (default: 1000)
+        
+    Returns:
+        Claude's complete response as a string
+    """
+    if anthropic is None:
         return "Error: Anthropic library not installed. Run 'uv add anthropic' to install."
+    
+    try:
+        if not os.getenv("ANTHROPIC_API_KEY"):
+            return "Error: ANTHROPIC_API_KEY not found in environment variables"
+        
+        client = _anthropic()
+        
+        chunks = []
+        async with client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                await _report_delta(ctx, chunks)
+        
+        return "".join(chunks) or "No response received"
+        
     except Exception as e:
         return f"Error calling Claude API: {str(e)}"
 
 @mcp.tool()
-def claude_vs_openai(prompt: str, claude_model: str = "claude-sonnet-4-20250514", openai_model: str = "gpt-4.1-mini") -> str:
+async def claude_vs_openai(prompt: str, claude_model: str = "claude-sonnet-4-20250514", openai_model: str = "gpt-4.1-mini") -> str:
     """Compare responses from both Claude and OpenAI for the same prompt.
     
     Args:
@@ -156,16 +374,53 @@ def claude_vs_openai(prompt: str, claude_model: str = "claude-sonnet-4-20250514"
     Returns:
         Comparison of both responses
     """
-    # Get Claude response
-    claude_response = claude_chat(prompt, claude_model, 800)
-    
-    # Get OpenAI response
-    openai_response = openai_chat(prompt, openai_model, 800)
+    # Query both providers concurrently - the calls are independent
+    claude_response, openai_response = await _gather_limited([
+        claude_chat(prompt, claude_model, 800),
+        openai_chat(prompt, openai_model, 800)
+    ])
     
     return f"**Claude ({claude_model}):**\n{claude_response}\n\n**OpenAI ({openai_model}):**\n{openai_response}"
 
 @mcp.tool()
-def claude_opus_4(prompt: str, max_tokens: int = 2000) -> str:
+async def batch_chat(prompts: List[str], provider: str = "openai", model: Optional[str] = None, max_tokens: int = 500, concurrency: int = 20) -> str:
+    """Send several independent prompts to one provider concurrently.
+    
+    Args:
+        prompts: List of prompts to send
+        provider: Which provider to use - 'openai' or 'claude' (default: openai)
+        model: Model to use (defaults to the provider's chat tool default)
+        max_tokens: Maximum tokens per response (default: 500)
+        concurrency: Maximum number of requests in flight at once (default: 20)
+        
+    Returns:
+        Each prompt followed by its response, in the original order
+    """
+    if provider == "openai":
+        chat = openai_chat
+    elif provider == "claude":
+        chat = claude_chat
+    else:
+        return f"Unknown provider: {provider}. Use 'openai' or 'claude'"
+    
+    if not prompts:
+        return "Error: No prompts provided"
+    
+    if model:
+        coros = [chat(prompt, model, max_tokens) for prompt in prompts]
+    else:
+        coros = [chat(prompt, max_tokens=max_tokens) for prompt in prompts]
+    
+    responses = await _gather_limited(coros, concurrency)
+    
+    result = []
+    for i, (prompt, response) in enumerate(zip(prompts, responses), 1):
+        result.append(f"**Prompt {i}:** {prompt}\n{response}")
+    
+    return "\n\n".join(result)
+
+@mcp.tool()
+async def claude_opus_4(prompt: str, max_tokens: int = 2000) -> str:
     """Send a prompt to Claude Opus 4 - the most powerful Claude model for complex tasks.
     
     Args:
@@ -175,10 +430,11 @@ def claude_opus_4(prompt: str, max_tokens: int = 2000) -> str:
     Returns:
         Claude Opus 4's response as a string
     """
-    return claude_chat(prompt, "claude-opus-4-20250514", max_tokens)
+    return await claude_chat(prompt, "claude-opus-4-20250514", max_tokens)
 
 @mcp.tool()
-def openai_web_search(query: str, model: str = "gpt-4.1-mini", max_tokens: int = 1000) -> str:
+@_llm_cached(ttl=24 * 3600)
+async def openai_web_search(query: str, model: str = "gpt-4.1-mini", max_tokens: int = 1000) -> str:
     """Ask OpenAI to search the web and provide an answer with sources.
     
     Args:
@@ -189,42 +445,10 @@ def openai_web_search(query: str, model: str = "gpt-4.1-mini", max_tokens: int =
     Returns:
         AI response with web search results and citations
     """
-    try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        if not client.api_key:
-            return "Error: OPENAI_API_KEY not found in environment variables"
-        
-        try:
-            response = client.responses.create(
-                model=model,
-                input=query,
-                tools=[{"type": "web_search"}]
-            )
-            
-            # Extract text from the response output
-            if response.output and len(response.output) > 0:
-                # Find the last message in the output
-                for item in reversed(response.output):
-                    if hasattr(item, 'content') and item.content:
-                        for content_item in item.content:
-                            if hasattr(content_item, 'text'):
-                                return content_item.text
-            
-            return "No response received from web search"
-            
-        except Exception as e:
-            return f"Error using web search tool: {str(e)}. This feature requires the Responses API."
-        
-    except ImportError:
-        return "Error: OpenAI library not installed. Run 'uv add openai' to install."
-    except Exception as e:
-        return f"Error calling OpenAI API: {str(e)}"
+    return await openai_with_tools(query, enable_web_search=True, model=model, max_tokens=max_tokens)
 
 @mcp.tool()
-def openai_with_tools(prompt: str, enable_web_search: bool = False, enable_file_search: bool = False, model: str = "gpt-4.1-mini", max_tokens: int = 1000) -> str:
+async def openai_with_tools(prompt: str, enable_web_search: bool = False, enable_file_search: bool = False, model: str = "gpt-4.1-mini", max_tokens: int = 1000) -> str:
     """Send a prompt to OpenAI with optional built-in tools enabled.
     
     Args:
@@ -237,14 +461,15 @@ def openai_with_tools(prompt: str, enable_web_search: bool = False, enable_file_
     Returns:
         AI response potentially enhanced with web search or file search
     """
+    if openai is None:
+        return "Error: OpenAI library not installed. Run 'uv add openai' to install."
+    
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        if not client.api_key:
+        if not os.getenv("OPENAI_API_KEY"):
             return "Error: OPENAI_API_KEY not found in environment variables"
         
+        client = _openai()
+        
         # Build tools list based on parameters
         tools = []
         if enable_web_search:
@@ -253,31 +478,84 @@ def openai_with_tools(prompt: str, enable_web_search: bool = False, enable_file_
             tools.append({"type": "file_search"})
         
         try:
-            response = client.responses.create(
+            response = await client.responses.create(
                 model=model,
                 input=prompt,
                 tools=tools if tools else None
             )
             
-            # Extract text from the response output
-            if response.output and len(response.output) > 0:
-                # Find the last message in the output
-                for item in reversed(response.output):
-                    if hasattr(item, 'content') and item.content:
-                        for content_item in item.content:
-                            if hasattr(content_item, 'text'):
-                                return content_item.text
+            text = _first_text(response)
+            if text is not None:
+                return text
             
             return "No response received"
             
         except Exception as e:
             return f"Error using enhanced tools: {str(e)}. Falling back to basic chat."
         
-    except ImportError:
-        return "Error: OpenAI library not installed. Run 'uv add openai' to install."
     except Exception as e:
         return f"Error calling OpenAI API: {str(e)}"
 
+@mcp.tool()
+def llm_cache_stats(clear: bool = False) -> str:
+    """Show hit/miss statistics for the LLM response cache.
+    
+    Args:
+        clear: Delete all cached responses after reporting (default: False)
+        
+    Returns:
+        Cache hit rate, entry count and database location
+    """
+    try:
+        hits = _llm_cache_stats["hits"]
+        misses = _llm_cache_stats["misses"]
+        total = hits + misses
+        
+        with _llm_cache_connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if clear:
+                conn.execute("DELETE FROM llm_cache")
+        
+        result = []
+        result.append(f"Cache database: {LLM_CACHE_PATH}")
+        result.append(f"Cached responses: {entries}")
+        result.append(f"Hits: {hits}")
+        result.append(f"Misses: {misses}")
+        result.append(f"Hit rate: {hits / total:.1%}" if total else "Hit rate: n/a")
+        if clear:
+            result.append("Cache cleared.")
+        
+        return "\n".join(result)
+        
+    except Exception as e:
+        return f"Error reading LLM cache: {str(e)}"
+
+def _tail(path, lines: int, block_size: int = 8192) -> str:
+    """Return the last `lines` lines of a file, reading backwards from the end."""
+    if lines <= 0:
+        return ""
+    
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        
+        # Read blocks from the end until we have enough newlines (or hit the start)
+        while position > 0 and data.count(b"\n") <= lines:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    
+    return b"\n".join(data.splitlines()[-lines:]).decode("utf-8", "replace")
+
+# Log file name predicates for read_claude_logs, keyed by log_type
+_LOG_MATCHERS = {
+    "breathsmith": lambda name: name == "mcp-server-breathsmith.log",
+    "mcp": lambda name: name == "mcp.log",
+    "all": lambda name: name.startswith("mcp") and name.endswith(".log"),
+}
+
 @mcp.tool()
 def read_claude_logs(log_type: str = "mcp", lines: int = 20) -> str:
     """Read Claude Desktop log files to help with debugging.
@@ -290,46 +568,33 @@ def read_claude_logs(log_type: str = "mcp", lines: int = 20) -> str:
         Recent log entries
     """
     try:
-        import subprocess
-        from pathlib import Path
-        
-        log_dir = Path.home() / "Library" / "Logs" / "Claude"
+        log_dir = CLAUDE_LOG_DIR
         
         if not log_dir.exists():
             return "Claude log directory not found. Are you on macOS?"
         
-        if log_type == "breathsmith":
-            log_files = list(log_dir.glob("mcp-server-breathsmith.log"))
-        elif log_type == "mcp":
-            log_files = [log_dir / "mcp.log"]
-        elif log_type == "all":
-            log_files = list(log_dir.glob("mcp*.log"))
-        else:
+        matches = _LOG_MATCHERS.get(log_type)
+        if matches is None:
             return f"Unknown log type: {log_type}. Use 'mcp', 'breathsmith', or 'all'"
         
+        # One directory read instead of a glob plus an exists() per file
+        with os.scandir(log_dir) as it:
+            log_files = sorted((entry for entry in it if matches(entry.name)), key=lambda entry: entry.name)
+        
         if not log_files:
             return f"No log files found for type: {log_type}"
         
         result = []
         for log_file in log_files:
-            if log_file.exists():
-                try:
-                    # Use tail to get recent lines
-                    tail_result = subprocess.run(
-                        ["tail", "-n", str(lines), str(log_file)],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    if tail_result.stdout:
-                        result.append(f"=== {log_file.name} ===")
-                        result.append(tail_result.stdout.strip())
-                    else:
-                        result.append(f"=== {log_file.name} === (empty or no recent entries)")
-                except subprocess.TimeoutExpired:
-                    result.append(f"=== {log_file.name} === (timeout reading file)")
-                except Exception as e:
-                    result.append(f"=== {log_file.name} === (error: {str(e)})")
+            try:
+                recent = _tail(log_file.path, lines)
+                if recent.strip():
+                    result.append(f"=== {log_file.name} ===")
+                    result.append(recent.strip())
+                else:
+                    result.append(f"=== {log_file.name} === (empty or no recent entries)")
+            except Exception as e:
+                result.append(f"=== {log_file.name} === (error: {str(e)})")
         
         return "\n\n".join(result) if result else "No log entries found"
         
@@ -344,20 +609,19 @@ def list_claude_logs() -> str:
         List of log files with their sizes and modification times
     """
     try:
-        from pathlib import Path
-        
-        log_dir = Path.home() / "Library" / "Logs" / "Claude"
+        log_dir = CLAUDE_LOG_DIR
         
         if not log_dir.exists():
             return "Claude log directory not found. Are you on macOS?"
         
-        log_files = list(log_dir.glob("*.log"))
+        with os.scandir(log_dir) as it:
+            log_files = sorted((entry for entry in it if entry.name.endswith(".log")), key=lambda entry: entry.name)
         
         if not log_files:
             return "No log files found in Claude directory"
         
         result = ["Claude Desktop Log Files:"]
-        for log_file in sorted(log_files):
+        for log_file in log_files:
             try:
                 stat = log_file.stat()
                 size_mb = stat.st_size / (1024 * 1024)
@@ -395,58 +659,154 @@ def watch_breathsmith_changes(enable: bool = True) -> str:
     else:
         return "File watching disabled (was not active anyway)"
 
-@mcp.tool()
-def uv_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
-    """Run UV commands like sync, add, run, etc.
+# Bytes of output kept per stream from child processes (first and last half)
+_MAX_CAPTURE_BYTES = 64 * 1024
+
+async def _read_capped(stream, limit: int = _MAX_CAPTURE_BYTES) -> str:
+    """Read a stream to EOF, keeping only its head and tail so memory stays bounded."""
+    half = limit // 2
+    head = bytearray()
+    tail = bytearray()
+    dropped = 0
+    
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        if len(head) < half:
+            take = half - len(head)
+            head += chunk[:take]
+            chunk = chunk[take:]
+        tail += chunk
+        if len(tail) > half:
+            dropped += len(tail) - half
+            del tail[:-half]
+    
+    text = head.decode("utf-8", "replace")
+    if dropped:
+        text += f"\n... [{dropped} bytes truncated] ...\n"
+    return text + tail.decode("utf-8", "replace")
+
+async def _run_process(cmd_parts: List[str], cwd: Optional[str], timeout: int) -> subprocess.CompletedProcess:
+    """Run a command without blocking the event loop, capturing bounded output.
+    
+    Raises subprocess.TimeoutExpired (after killing the process) if it runs
+    longer than timeout seconds, matching subprocess.run. The process is
+    also killed if the call is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd_parts,
+        cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    output = asyncio.gather(_read_capped(proc.stdout), _read_capped(proc.stderr), proc.wait())
+    try:
+        stdout, stderr, _ = await asyncio.wait_for(output, timeout)
+    except BaseException as e:
+        # Timed out or the tool call was cancelled - don't leave the child running
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        # Retrieve the readers' outcome so asyncio doesn't log it as unhandled
+        output.add_done_callback(lambda future: future.cancelled() or future.exception())
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(cmd_parts, timeout)
+        raise
+    
+    return subprocess.CompletedProcess(cmd_parts, proc.returncode, stdout, stderr)
+
+def _probe(cwd: str, names: Set[str]) -> Set[str]:
+    """Return which of `names` exist in cwd, using one os.scandir pass.
+    
+    Raises FileNotFoundError or NotADirectoryError if cwd is not a directory.
+    """
+    try:
+        with os.scandir(cwd) as it:
+            return {entry.name for entry in it if entry.name in names}
+    except PermissionError:
+        return set()
+
+@lru_cache(maxsize=256)
+def _parse_cmd(command: str) -> Tuple[str, ...]:
+    """Split a command string shell-style, memoized for repeated commands."""
+    return tuple(shlex.split(command))
+
+async def _run_cmd(
+    program: str,
+    command: Optional[str],
+    directory: Optional[str],
+    timeout: int,
+    probes: Sequence[Tuple[str, str]] = (),
+    not_found_hint: str = "",
+    executable: Optional[str] = None,
+    version: Optional[str] = None,
+    get_version: Optional[Callable[[], Awaitable[str]]] = None,
+    warn_if_present: Sequence[Tuple[Sequence[str], str]] = (),
+    allow_empty: bool = False
+) -> str:
+    """Run a command-line program and format its result for a tool response.
     
     Args:
-        command: The uv command to run (without 'uv' prefix)
-        directory: Optional directory to run the command in (defaults to current directory)
-        timeout: Timeout in seconds (default: 60)
+        program: Program name shown in the output (and run, unless executable is given)
+        command: Arguments for the program, parsed with shell-style quoting
+        directory: Directory to run in (defaults to current directory)
+        timeout: Timeout in seconds
+        probes: (file name, label) pairs reported as present/absent in the directory
+        not_found_hint: Installation hint shown when the program is missing
+        executable: Path of the program to run if it is not simply `program`
+        version: Program version to report, if known
+        get_version: Coroutine function returning the version, awaited only once the
+            command and directory have been validated
+        warn_if_present: (file names, warning) pairs - the warning is reported if any file exists
+        allow_empty: Run the bare program for an empty command instead of erroring
         
     Returns:
         Command output and exit status
-        
-    Examples:
-        - uv_command("--version") - Check UV version
-        - uv_command("sync") - Install/sync dependencies  
-        - uv_command("add requests") - Add a package
-        - uv_command("remove requests") - Remove a package
-        - uv_command("pip list") - List installed packages
-        - uv_command("run script.py") - Run a Python script
-        - uv_command("run -m json.tool --help") - Run a Python module
-        
-    Notes:
-        - Don't include 'uv' in the command - it's added automatically
-        - For 'uv run python -c', complex quoting may not work - use scripts instead
-        - Long-running commands (like servers) will timeout after specified seconds
-        - Both stdout and stderr are captured and returned
     """
     try:
-        # Basic safety check - only allow uv commands
-        if not command.strip():
+        command = (command or "").strip()
+        if not command and not allow_empty:
             return "Error: Empty command provided"
-            
-        # Split command into parts
-        cmd_parts = ["uv"] + command.split()
+        
+        # Split command into parts, honouring quoted arguments
+        cmd_parts = [executable or program, *_parse_cmd(command)]
         
         # Set working directory
         cwd = directory if directory else os.getcwd()
-        if directory and not os.path.exists(directory):
-            return f"Error: Directory '{directory}' does not exist"
-            
+        
+        # Check project files (helpful info) - one directory read also validates cwd
+        wanted = {name for name, _ in probes}
+        wanted.update(name for names, _ in warn_if_present for name in names)
+        if wanted:
+            try:
+                present = _probe(cwd, wanted)
+            except (FileNotFoundError, NotADirectoryError):
+                return f"Error: Directory '{cwd}' does not exist"
+        elif not os.path.isdir(cwd):
+            return f"Error: Directory '{cwd}' does not exist"
+        else:
+            present = set()
+        
+        found = [(label, name in present) for name, label in probes]
+        warnings = [warning for names, warning in warn_if_present if present.intersection(names)]
+        
+        if get_version is not None:
+            version = await get_version()
+        
         # Run the command
-        result = subprocess.run(
-            cmd_parts,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        result = await _run_process(cmd_parts, cwd, timeout)
         
         output_parts = []
-        output_parts.append(f"Command: uv {command}")
+        output_parts.append(f"Command: {program} {command}" if command else f"Command: {program}")
         output_parts.append(f"Directory: {cwd}")
+        if version is not None:
+            output_parts.append(f"{program.capitalize()} version: {version}")
+        for label, exists in found:
+            output_parts.append(f"{label}: {exists}")
+        output_parts.extend(warnings)
         output_parts.append(f"Exit code: {result.returncode}")
         
         if result.stdout:
@@ -460,12 +820,41 @@ def uv_command(command: str, directory: Optional[str] = None, timeout: int = 60)
     except subprocess.TimeoutExpired:
         return f"Error: Command timed out after {timeout} seconds"
     except FileNotFoundError:
-        return "Error: 'uv' command not found. Is UV installed?"
+        return f"Error: '{program}' command not found. {not_found_hint}".rstrip()
     except Exception as e:
-        return f"Error running uv command: {str(e)}"
+        return f"Error running {program} command: {str(e)}"
+
+@mcp.tool()
+async def uv_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
+    """Run UV commands like sync, add, run, etc.
+    
+    Args:
+        command: The uv command to run (without 'uv' prefix)
+        directory: Optional directory to run the command in (defaults to current directory)
+        timeout: Timeout in seconds (default: 60)
+        
+    Returns:
+        Command output and exit status
+        
+    Examples:
+        - uv_command("--version") - Check UV version
+        - uv_command("sync") - Install/sync dependencies  
+        - uv_command("add requests") - Add a package
+        - uv_command("remove requests") - Remove a package
+        - uv_command("pip list") - List installed packages
+        - uv_command("run script.py") - Run a Python script
+        - uv_command("run -m json.tool --help") - Run a Python module
+        
+    Notes:
+        - Don't include 'uv' in the command - it's added automatically
+        - Arguments are split with shell-style quoting, e.g. uv_command('run python -c "print(1)"')
+        - Long-running commands (like servers) will timeout after specified seconds
+        - Both stdout and stderr are captured and returned (very long output keeps its first and last 32KB)
+    """
+    return await _run_cmd("uv", command, directory, timeout, not_found_hint="Is UV installed?")
 
 @mcp.tool()
-def npm_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
+async def npm_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
     """Run npm commands like install, run, test, etc.
     
     Args:
@@ -494,58 +883,17 @@ def npm_command(command: str, directory: Optional[str] = None, timeout: int = 60
         - Commands are run in the specified directory or current working directory
         - Will automatically detect and use package.json in the target directory
         - Long-running commands (like dev servers) will timeout after specified seconds
-        - Both stdout and stderr are captured and returned
+        - Both stdout and stderr are captured and returned (very long output keeps its first and last 32KB)
         - For global installs, use "install -g package-name"
     """
-    try:
-        # Basic safety check - only allow npm commands
-        if not command.strip():
-            return "Error: Empty command provided"
-            
-        # Split command into parts
-        cmd_parts = ["npm"] + command.split()
-        
-        # Set working directory
-        cwd = directory if directory else os.getcwd()
-        if directory and not os.path.exists(directory):
-            return f"Error: Directory '{directory}' does not exist"
-            
-        # Check if package.json exists in target directory (helpful info)
-        package_json_path = Path(cwd) / "package.json"
-        has_package_json = package_json_path.exists()
-        
-        # Run the command
-        result = subprocess.run(
-            cmd_parts,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        
-        output_parts = []
-        output_parts.append(f"Command: npm {command}")
-        output_parts.append(f"Directory: {cwd}")
-        output_parts.append(f"Package.json present: {has_package_json}")
-        output_parts.append(f"Exit code: {result.returncode}")
-        
-        if result.stdout:
-            output_parts.append(f"\nSTDOUT:\n{result.stdout.strip()}")
-            
-        if result.stderr:
-            output_parts.append(f"\nSTDERR:\n{result.stderr.strip()}")
-            
-        return "\n".join(output_parts)
-        
-    except subprocess.TimeoutExpired:
-        return f"Error: Command timed out after {timeout} seconds"
-    except FileNotFoundError:
-        return "Error: 'npm' command not found. Is Node.js/npm installed?"
-    except Exception as e:
-        return f"Error running npm command: {str(e)}"
+    return await _run_cmd(
+        "npm", command, directory, timeout,
+        probes=[("package.json", "Package.json present")],
+        not_found_hint="Is Node.js/npm installed?"
+    )
 
 @mcp.tool()
-def npx_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
+async def npx_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
     """Run npx commands to execute packages without installing them globally.
     
     Args:
@@ -573,63 +921,36 @@ def npx_command(command: str, directory: Optional[str] = None, timeout: int = 60
         - Commands are run in the specified directory or current working directory
         - npx automatically downloads and runs packages if not locally installed
         - Long-running commands (like dev servers) will timeout after specified seconds
-        - Both stdout and stderr are captured and returned
+        - Both stdout and stderr are captured and returned (very long output keeps its first and last 32KB)
         - Use for one-time package execution or scaffolding tools
     """
-    try:
-        # Basic safety check - only allow npx commands
-        if not command.strip():
-            return "Error: Empty command provided"
-            
-        # Split command into parts
-        cmd_parts = ["npx"] + command.split()
-        
-        # Set working directory
-        cwd = directory if directory else os.getcwd()
-        if directory and not os.path.exists(directory):
-            return f"Error: Directory '{directory}' does not exist"
-            
-        # Check if package.json exists in target directory (helpful info)
-        package_json_path = Path(cwd) / "package.json"
-        has_package_json = package_json_path.exists()
-        
-        # Check if node_modules exists (indicates local packages available)
-        node_modules_path = Path(cwd) / "node_modules"
-        has_node_modules = node_modules_path.exists()
-        
-        # Run the command
-        result = subprocess.run(
-            cmd_parts,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        
-        output_parts = []
-        output_parts.append(f"Command: npx {command}")
-        output_parts.append(f"Directory: {cwd}")
-        output_parts.append(f"Package.json present: {has_package_json}")
-        output_parts.append(f"Node_modules present: {has_node_modules}")
-        output_parts.append(f"Exit code: {result.returncode}")
-        
-        if result.stdout:
-            output_parts.append(f"\nSTDOUT:\n{result.stdout.strip()}")
-            
-        if result.stderr:
-            output_parts.append(f"\nSTDERR:\n{result.stderr.strip()}")
-            
-        return "\n".join(output_parts)
-        
-    except subprocess.TimeoutExpired:
-        return f"Error: Command timed out after {timeout} seconds"
-    except FileNotFoundError:
-        return "Error: 'npx' command not found. Is Node.js/npm installed?"
-    except Exception as e:
-        return f"Error running npx command: {str(e)}"
+    return await _run_cmd(
+        "npx", command, directory, timeout,
+        probes=[("package.json", "Package.json present"), ("node_modules", "Node_modules present")],
+        not_found_hint="Is Node.js/npm installed?"
+    )
+
+# Set once a `yarn --version` lookup succeeds
+_YARN_VERSION: Optional[str] = None
+
+async def _yarn_version() -> str:
+    """Look up the installed Yarn version once per server process.
+    
+    Failed lookups aren't cached, so installing Yarn later is picked up.
+    """
+    global _YARN_VERSION
+    
+    if _YARN_VERSION is None:
+        try:
+            version_result = await _run_process(["yarn", "--version"], None, timeout=10)
+            if version_result.returncode == 0:
+                _YARN_VERSION = version_result.stdout.strip()
+        except Exception:
+            pass
+    return _YARN_VERSION or "unknown"
 
 @mcp.tool()
-def yarn_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
+async def yarn_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
     """Run Yarn commands for package management and script execution.
     
     Args:
@@ -661,86 +982,79 @@ def yarn_command(command: str, directory: Optional[str] = None, timeout: int = 6
         - Commands are run in the specified directory or current working directory
         - Will automatically detect yarn.lock and package.json files
         - Long-running commands (like dev servers) will timeout after specified seconds
-        - Both stdout and stderr are captured and returned
+        - Both stdout and stderr are captured and returned (very long output keeps its first and last 32KB)
         - Supports both Yarn 1.x and Yarn 2+ (Berry) commands
     """
+    # Empty command defaults to install; the version helps identify Yarn 1 vs 2+
+    return await _run_cmd(
+        "yarn", command, directory, timeout,
+        probes=[
+            ("package.json", "Package.json present"),
+            ("yarn.lock", "Yarn.lock present"),
+            ("node_modules", "Node_modules present"),
+        ],
+        not_found_hint="Is Yarn installed? Install with: npm install -g yarn",
+        get_version=_yarn_version,
+        allow_empty=True
+    )
+
+# Common bun installation locations, checked when bun is not in PATH
+_BUN_CANDIDATES = (
+    os.path.expanduser("~/.bun/bin/bun"),
+    "/usr/local/bin/bun",
+    "/opt/homebrew/bin/bun",
+)
+_BUN_PATH: Optional[str] = None
+# (path, mtime, version) of the last `bun --version` run
+_BUN_VERSION_CACHE: Optional[Tuple[str, float, str]] = None
+
+def _resolve_bun() -> Tuple[Optional[str], Optional[float]]:
+    """Find the bun executable and its mtime, cached for the server process.
+    
+    The lookup is redone if bun was not found before or the cached binary
+    has since disappeared.
+    """
+    global _BUN_PATH
+    
     try:
-        # Basic safety check
-        if command is None:
-            command = ""
-        command = command.strip()
-        
-        # Empty command defaults to install
-        if not command:
-            cmd_parts = ["yarn"]
-        else:
-            cmd_parts = ["yarn"] + command.split()
-        
-        # Set working directory
-        cwd = directory if directory else os.getcwd()
-        if directory and not os.path.exists(directory):
-            return f"Error: Directory '{directory}' does not exist"
-            
-        # Check project files
-        package_json_path = Path(cwd) / "package.json"
-        has_package_json = package_json_path.exists()
-        
-        yarn_lock_path = Path(cwd) / "yarn.lock"
-        has_yarn_lock = yarn_lock_path.exists()
-        
-        node_modules_path = Path(cwd) / "node_modules"
-        has_node_modules = node_modules_path.exists()
-        
-        # Check for Yarn version (helps identify Yarn 1 vs 2+)
-        yarn_version = "unknown"
+        st = os.stat(_BUN_PATH) if _BUN_PATH else None
+    except OSError:
+        st = None
+    
+    if st is None:
+        _BUN_PATH = shutil.which("bun") or next(
+            (path for path in _BUN_CANDIDATES if os.path.exists(path)), None
+        )
+        if not _BUN_PATH:
+            return None, None
         try:
-            version_result = subprocess.run(
-                ["yarn", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            st = os.stat(_BUN_PATH)
+        except OSError:
+            return _BUN_PATH, None
+    
+    return _BUN_PATH, st.st_mtime
+
+async def _bun_version(bun_executable: Optional[str], mtime: Optional[float]) -> str:
+    """Return bun's version, re-read only when the binary's mtime changes (e.g. after `bun upgrade`)."""
+    global _BUN_VERSION_CACHE
+    
+    if bun_executable is None or mtime is None:
+        return "unknown"
+    
+    if _BUN_VERSION_CACHE is None or _BUN_VERSION_CACHE[:2] != (bun_executable, mtime):
+        version = "unknown"
+        try:
+            version_result = await _run_process([bun_executable, "--version"], None, timeout=2)
             if version_result.returncode == 0:
-                yarn_version = version_result.stdout.strip()
-        except:
+                version = version_result.stdout.strip()
+        except Exception:
             pass
-        
-        # Run the command
-        result = subprocess.run(
-            cmd_parts,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        
-        output_parts = []
-        display_command = "yarn" if not command else f"yarn {command}"
-        output_parts.append(f"Command: {display_command}")
-        output_parts.append(f"Directory: {cwd}")
-        output_parts.append(f"Yarn version: {yarn_version}")
-        output_parts.append(f"Package.json present: {has_package_json}")
-        output_parts.append(f"Yarn.lock present: {has_yarn_lock}")
-        output_parts.append(f"Node_modules present: {has_node_modules}")
-        output_parts.append(f"Exit code: {result.returncode}")
-        
-        if result.stdout:
-            output_parts.append(f"\nSTDOUT:\n{result.stdout.strip()}")
-            
-        if result.stderr:
-            output_parts.append(f"\nSTDERR:\n{result.stderr.strip()}")
-            
-        return "\n".join(output_parts)
-        
-    except subprocess.TimeoutExpired:
-        return f"Error: Command timed out after {timeout} seconds"
-    except FileNotFoundError:
-        return "Error: 'yarn' command not found. Is Yarn installed? Install with: npm install -g yarn"
-    except Exception as e:
-        return f"Error running yarn command: {str(e)}"
+        _BUN_VERSION_CACHE = (bun_executable, mtime, version)
+    
+    return _BUN_VERSION_CACHE[2]
 
 @mcp.tool()
-def bun_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
+async def bun_command(command: str, directory: Optional[str] = None, timeout: int = 60) -> str:
     """Run Bun commands for ultra-fast package management and JavaScript execution.
     
     Args:
@@ -775,112 +1089,139 @@ def bun_command(command: str, directory: Optional[str] = None, timeout: int = 60
         - Bun is much faster than npm/yarn for package operations
         - Supports running TypeScript files directly without compilation
         - Long-running commands (like dev servers) will timeout after specified seconds
-        - Both stdout and stderr are captured and returned
+        - Both stdout and stderr are captured and returned (very long output keeps its first and last 32KB)
+    """
+    bun_executable, bun_mtime = _resolve_bun()
+    
+    return await _run_cmd(
+        "bun", command, directory, timeout,
+        probes=[
+            ("package.json", "Package.json present"),
+            ("bun.lockb", "Bun.lockb present"),
+            ("node_modules", "Node_modules present"),
+        ],
+        not_found_hint="Is Bun installed? Install from: https://bun.sh",
+        executable=bun_executable or "bun",
+        # Only spawn `bun --version` once the command and directory are valid
+        get_version=partial(_bun_version, bun_executable, bun_mtime),
+        # Other lock files might conflict with bun's
+        warn_if_present=[
+            (("yarn.lock", "package-lock.json"), "⚠️ Other lock files detected (yarn.lock/package-lock.json)"),
+        ]
+    )
+
+# Maximum rows returned by sqlite_execute
+MAX_RESULT_ROWS = 1000
+
+def _connect_ro(db_path: Path) -> sqlite3.Connection:
+    """Open an existing SQLite database read-only.
+    
+    Read-only connections skip the write-side journal setup and can't
+    modify the database by accident.
+    """
+    return sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+
+def _connect_rw(db_path: Path) -> sqlite3.Connection:
+    """Open a SQLite database for writing, tuned for fewer fsyncs per commit.
+    
+    Only databases created here are switched to WAL - journal_mode is stored
+    in the file, so existing databases keep whatever mode their owner chose.
     """
+    created = not os.path.exists(db_path)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False)
     try:
-        # Basic safety check
-        if not command.strip():
-            return "Error: Empty command provided"
-            
-        # Split command into parts - but first try to find bun in common locations
-        bun_executable = "bun"
-        
-        # Check common bun installation paths if bun is not in PATH
-        try:
-            subprocess.run(["bun"], capture_output=True, timeout=5)
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            # Try common bun installation locations
-            common_bun_paths = [
-                os.path.expanduser("~/.bun/bin/bun"),
-                "/usr/local/bin/bun",
-                "/opt/homebrew/bin/bun",
-            ]
-            
-            for bun_path in common_bun_paths:
-                if os.path.exists(bun_path):
-                    bun_executable = bun_path
-                    break
-        
-        cmd_parts = [bun_executable] + command.split()
-        
-        # Set working directory
-        cwd = directory if directory else os.getcwd()
-        if directory and not os.path.exists(directory):
-            return f"Error: Directory '{directory}' does not exist"
-            
-        # Check project files
-        package_json_path = Path(cwd) / "package.json"
-        has_package_json = package_json_path.exists()
-        
-        bun_lockb_path = Path(cwd) / "bun.lockb"
-        has_bun_lockb = bun_lockb_path.exists()
-        
-        node_modules_path = Path(cwd) / "node_modules"
-        has_node_modules = node_modules_path.exists()
-        
-        # Check for other lock files that might conflict
-        yarn_lock_path = Path(cwd) / "yarn.lock"
-        package_lock_path = Path(cwd) / "package-lock.json"
-        has_other_locks = yarn_lock_path.exists() or package_lock_path.exists()
-        
-        # Check Bun version
-        bun_version = "unknown"
-        try:
-            version_result = subprocess.run(
-                [bun_executable, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if version_result.returncode == 0:
-                bun_version = version_result.stdout.strip()
-        except:
-            pass
-        
-        # Run the command
-        result = subprocess.run(
-            cmd_parts,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
+        if created:
+            conn.execute("PRAGMA journal_mode=WAL")
+        # These settings only last for the connection
+        conn.executescript(
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"
         )
-        
-        output_parts = []
-        output_parts.append(f"Command: bun {command}")
-        output_parts.append(f"Directory: {cwd}")
-        output_parts.append(f"Bun version: {bun_version}")
-        output_parts.append(f"Package.json present: {has_package_json}")
-        output_parts.append(f"Bun.lockb present: {has_bun_lockb}")
-        output_parts.append(f"Node_modules present: {has_node_modules}")
-        if has_other_locks:
-            output_parts.append(f"⚠️ Other lock files detected (yarn.lock/package-lock.json)")
-        output_parts.append(f"Exit code: {result.returncode}")
-        
-        if result.stdout:
-            output_parts.append(f"\nSTDOUT:\n{result.stdout.strip()}")
-            
-        if result.stderr:
-            output_parts.append(f"\nSTDERR:\n{result.stderr.strip()}")
-            
-        return "\n".join(output_parts)
-        
-    except subprocess.TimeoutExpired:
-        return f"Error: Command timed out after {timeout} seconds"
+    except sqlite3.Error:
+        # e.g. read-only mounts; fall back to the default settings
+        pass
+    return conn
+
+# Open connections reused across calls, keyed by (path, read_only)
+_CONN_CACHE_SIZE = 8
+_conn_cache: "OrderedDict[Tuple[str, bool], Tuple[sqlite3.Connection, threading.Lock, Optional[Tuple[int, int]]]]" = OrderedDict()
+_conn_cache_lock = threading.Lock()
+_created_dirs: Set[str] = set()
+
+def _file_id(path: str) -> Optional[Tuple[int, int]]:
+    """Return (device, inode) for path, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
     except FileNotFoundError:
-        return "Error: 'bun' command not found. Is Bun installed? Install from: https://bun.sh"
-    except Exception as e:
-        return f"Error running bun command: {str(e)}"
+        return None
+    return (st.st_dev, st.st_ino)
+
+@contextmanager
+def _pooled_connection(db_path: Path, read_only: bool) -> Iterator[sqlite3.Connection]:
+    """Borrow a cached connection to db_path, opening one if needed.
+    
+    Commits on success and rolls back on error. A cached connection is
+    dropped if the file it was opened on has been deleted or replaced.
+    """
+    key = (str(db_path), read_only)
+    file_id = _file_id(key[0])
+    stale = []
+    
+    with _conn_cache_lock:
+        entry = _conn_cache.get(key)
+        if entry is not None and entry[2] != file_id:
+            stale.append(_conn_cache.pop(key))
+            entry = None
+        
+        if entry is None:
+            if not read_only:
+                parent = str(db_path.parent)
+                if parent not in _created_dirs:
+                    db_path.parent.mkdir(parents=True, exist_ok=True)
+                    _created_dirs.add(parent)
+            conn = _connect_ro(db_path) if read_only else _connect_rw(db_path)
+            entry = (conn, threading.Lock(), _file_id(key[0]))
+            _conn_cache[key] = entry
+            while len(_conn_cache) > _CONN_CACHE_SIZE:
+                stale.append(_conn_cache.popitem(last=False)[1])
+        else:
+            _conn_cache.move_to_end(key)
+    
+    # Close evicted connections once nobody is using them
+    for old_conn, old_lock, _ in stale:
+        with old_lock:
+            old_conn.close()
+    
+    conn, lock = entry[0], entry[1]
+    with lock:
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        if conn.in_transaction:
+            conn.commit()
 
 @mcp.tool()
-def sqlite_execute(database_path: str, query: str, params: Optional[List] = None, fetch_results: bool = True) -> str:
+def sqlite_execute(
+    database_path: str,
+    query: str,
+    params: Optional[List] = None,
+    fetch_results: bool = True,
+    cursor_column: Optional[str] = None,
+    cursor_value: Optional[Union[int, float, str]] = None,
+) -> str:
     """Execute SQLite queries and return results.
     
     Args:
         database_path: Path to the SQLite database file
         query: SQL query to execute
-        params: Optional list of parameters for parameterized queries
+        params: Optional list of parameters for parameterized queries, or a list of
+            parameter lists to run the statement once per row
         fetch_results: Whether to fetch and return results (default: True)
+        cursor_column: Optional column to page a SELECT by (keyset pagination); should be unique
+        cursor_value: Return only rows with cursor_column greater than this (the previous page's next cursor)
         
     Returns:
         Query results as formatted text or execution status
@@ -889,14 +1230,18 @@ def sqlite_execute(database_path: str, query: str, params: Optional[List] = None
         - sqlite_execute("data.db", "SELECT * FROM users LIMIT 5") - Query data
         - sqlite_execute("data.db", "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)") - Create table
         - sqlite_execute("data.db", "INSERT INTO users (name) VALUES (?)", ["Alice"]) - Insert with params
+        - sqlite_execute("data.db", "INSERT INTO users (name) VALUES (?)", [["Bob"], ["Carol"]], fetch_results=False) - Insert many rows
         - sqlite_execute("data.db", "SELECT COUNT(*) FROM users") - Count rows
+        - sqlite_execute("data.db", "SELECT * FROM users", cursor_column="id", cursor_value=1000) - Next page after id 1000
         - sqlite_execute("data.db", ".schema users", fetch_results=False) - Get table schema
         
     Notes:
-        - Database file will be created if it doesn't exist
+        - Database file will be created if it doesn't exist (new databases use WAL journaling;
+          existing databases keep their journal mode)
         - Use parameterized queries (?) for safe data insertion
         - Set fetch_results=False for CREATE, INSERT, UPDATE, DELETE operations
-        - Results are limited to 1000 rows for performance
+        - Results are limited to 1000 rows for performance; use cursor_column to page
+          through larger results by index seek instead of OFFSET
         - Use PRAGMA statements to configure database settings
     """
     try:
@@ -905,52 +1250,98 @@ def sqlite_execute(database_path: str, query: str, params: Optional[List] = None
         if not db_path.is_absolute():
             # Make relative paths relative to current working directory
             db_path = Path.cwd() / db_path
+        
+        # Only the leading keyword matters, so don't copy the whole query
+        query_head = query.lstrip()[:16].upper()
             
-        # Ensure parent directory exists
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Plain SELECTs on an existing database don't need write access
+        read_only = (
+            fetch_results
+            and query_head.startswith(('SELECT', 'EXPLAIN'))
+            and os.path.exists(db_path)
+        )
         
-        # Connect to database
-        with sqlite3.connect(str(db_path)) as conn:
-            conn.row_factory = sqlite3.Row  # Enable column access by name
+        if cursor_column is not None:
+            if not (fetch_results and query_head.startswith('SELECT')):
+                return "Error: cursor_column can only be used with SELECT queries"
+            
+            # Keyset pagination: wrap the query so SQLite can seek past the
+            # previous page instead of scanning and discarding OFFSET rows
+            inner_query = query.strip().rstrip(';')
+            column = _quote_identifier(cursor_column)
+            inner_params = list(params or [])
+            if cursor_value is None:
+                query = f"SELECT * FROM (\n{inner_query}\n) ORDER BY {column} LIMIT {MAX_RESULT_ROWS}"
+                params = inner_params
+            else:
+                query = f"SELECT * FROM (\n{inner_query}\n) WHERE {column} > ? ORDER BY {column} LIMIT {MAX_RESULT_ROWS}"
+                params = inner_params + [cursor_value]
+        
+        # Reuse an open connection; the parent directory is created if needed
+        with _pooled_connection(db_path, read_only) as conn:
             cursor = conn.cursor()
             
-            # Execute query with optional parameters
-            if params:
+            if cursor_column is not None:
+                # An unknown double-quoted name would silently be treated as a
+                # string literal, so check it against the result columns first
+                cursor.execute(f"SELECT * FROM (\n{inner_query}\n) LIMIT 0", inner_params)
+                # SQLite identifiers are case-insensitive
+                result_columns = [description[0].casefold() for description in cursor.description]
+                if cursor_column.casefold() not in result_columns:
+                    return f"Error: cursor_column '{cursor_column}' is not a column of the query results"
+                cursor_index = result_columns.index(cursor_column.casefold())
+            
+            # Execute query with optional parameters; a list of parameter
+            # lists is run as one batch with a single prepared statement
+            if params and isinstance(params[0], (list, tuple)):
+                cursor.executemany(query, params)
+            elif params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             
             # Handle different types of queries
-            if fetch_results and query.strip().upper().startswith(('SELECT', 'PRAGMA', 'EXPLAIN')):
-                # Fetch results for queries that return data
-                rows = cursor.fetchmany(1000)  # Limit to 1000 rows
+            if fetch_results and query_head.startswith(('SELECT', 'PRAGMA', 'EXPLAIN')):
+                # Format rows into one buffer as they are fetched, in batches,
+                # so only one batch of row objects is alive at a time
+                rows = io.StringIO()
+                row_count = 0
+                last_row = None
+                cursor.arraysize = 200
                 
-                if not rows:
+                while row_count < MAX_RESULT_ROWS:
+                    batch = cursor.fetchmany(min(cursor.arraysize, MAX_RESULT_ROWS - row_count))
+                    if not batch:
+                        break
+                    for row in batch:
+                        rows.write("\n")
+                        rows.write(" | ".join(['NULL' if value is None else str(value) for value in row]))
+                    row_count += len(batch)
+                    last_row = batch[-1]
+                
+                if not row_count:
                     return f"Query executed successfully. No rows returned.\nDatabase: {db_path}"
                 
                 # Format results as a table
                 columns = [description[0] for description in cursor.description]
-                result_lines = []
-                result_lines.append(f"Database: {db_path}")
-                result_lines.append(f"Rows returned: {len(rows)}")
-                result_lines.append("")
-                
-                # Add column headers
                 header = " | ".join(columns)
-                result_lines.append(header)
-                result_lines.append("-" * len(header))
-                
-                # Add data rows
-                for row in rows:
-                    row_data = [str(row[col]) if row[col] is not None else 'NULL' for col in columns]
-                    result_lines.append(" | ".join(row_data))
+                result = io.StringIO()
+                result.write(f"Database: {db_path}\n")
+                result.write(f"Rows returned: {row_count}\n\n")
+                result.write(header)
+                result.write("\n")
+                result.write(_dashes(len(header)))
+                result.write(rows.getvalue())
                 
                 # Check if there might be more rows
-                if len(rows) == 1000:
-                    result_lines.append("")
-                    result_lines.append("Note: Results limited to 1000 rows. Use LIMIT/OFFSET for pagination.")
+                if row_count == MAX_RESULT_ROWS and cursor_column is not None:
+                    next_cursor = last_row[cursor_index]
+                    result.write(f"\n\nNext cursor: {orjson.dumps(next_cursor, default=str).decode()}")
+                    result.write(f"\nPass it as cursor_value with cursor_column='{cursor_column}' to fetch the next page.")
+                elif row_count == MAX_RESULT_ROWS:
+                    result.write(f"\n\nNote: Results limited to {MAX_RESULT_ROWS} rows. Use cursor_column for pagination.")
                 
-                return "\n".join(result_lines)
+                return result.getvalue()
             
             else:
                 # For INSERT, UPDATE, DELETE, CREATE, etc.
@@ -965,7 +1356,7 @@ def sqlite_execute(database_path: str, query: str, params: Optional[List] = None
                     result_lines.append(f"Rows affected: {affected_rows}")
                 
                 # For INSERT operations, show the last inserted row ID
-                if query.strip().upper().startswith('INSERT') and cursor.lastrowid:
+                if query_head.startswith('INSERT') and cursor.lastrowid:
                     result_lines.append(f"Last inserted row ID: {cursor.lastrowid}")
                 
                 return "\n".join(result_lines)
@@ -975,12 +1366,56 @@ def sqlite_execute(database_path: str, query: str, params: Optional[List] = None
     except Exception as e:
         return f"Error executing SQLite query: {str(e)}\nDatabase: {database_path}"
 
+# Underlines reused across tables and calls instead of rebuilt per line
+_SEP50 = "=" * 50
+
+@lru_cache(maxsize=256)
+def _dashes(n: int) -> str:
+    """Return a run of n dashes for underlining a heading."""
+    return "-" * n
+
+def _quote_identifier(name: str) -> str:
+    """Quote a table or column name for interpolation into SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+def _count_rows(cursor: sqlite3.Cursor, tables: List[str]) -> Dict[str, int]:
+    """Count rows in several tables with UNION ALL queries instead of one query each."""
+    counts = {}
+    # SQLite caps compound SELECTs at 500 terms by default
+    for start in range(0, len(tables), 500):
+        chunk = tables[start:start + 500]
+        cursor.execute(
+            " UNION ALL ".join(f"SELECT ?, COUNT(*) FROM {_quote_identifier(table)}" for table in chunk),
+            chunk
+        )
+        counts.update(cursor.fetchall())
+    return counts
+
+def _approx_row_counts(cursor: sqlite3.Cursor) -> Dict[str, int]:
+    """Read estimated row counts from sqlite_stat1, if ANALYZE has been run."""
+    try:
+        cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+    except sqlite3.OperationalError:
+        # No sqlite_stat1 table
+        return {}
+    
+    counts = {}
+    for table_name, stat in cursor.fetchall():
+        try:
+            estimate = int(stat.split()[0])
+        except (AttributeError, IndexError, ValueError):
+            continue
+        # Partial indexes may cover fewer rows than the table, so keep the largest
+        counts[table_name] = max(counts.get(table_name, 0), estimate)
+    return counts
+
 @mcp.tool()
-def sqlite_info(database_path: str) -> str:
+def sqlite_info(database_path: str, exact_counts: bool = False) -> str:
     """Get information about a SQLite database structure.
     
     Args:
         database_path: Path to the SQLite database file
+        exact_counts: Always COUNT(*) every table, even when ANALYZE statistics are available (default: False)
         
     Returns:
         Database schema information and table details
@@ -990,6 +1425,8 @@ def sqlite_info(database_path: str) -> str:
         
     Notes:
         - Shows all tables, their schemas, and row counts
+        - Tables covered by ANALYZE statistics (sqlite_stat1) show an approximate row count
+          instead of a full-table COUNT(*), which can be slow on large tables
         - Useful for exploring unknown databases
         - Returns empty result if database doesn't exist
     """
@@ -998,14 +1435,17 @@ def sqlite_info(database_path: str) -> str:
         if not db_path.is_absolute():
             db_path = Path.cwd() / db_path
             
-        if not db_path.exists():
+        # One stat call both checks existence and gives the file size
+        try:
+            st = os.stat(db_path)
+        except FileNotFoundError:
             return f"Database does not exist: {db_path}"
             
-        with sqlite3.connect(str(db_path)) as conn:
+        with _pooled_connection(db_path, read_only=True) as conn:
             cursor = conn.cursor()
             result_lines = []
             result_lines.append(f"Database: {db_path}")
-            result_lines.append(f"File size: {db_path.stat().st_size / 1024:.2f} KB")
+            result_lines.append(f"File size: {st.st_size / 1024:.2f} KB")
             result_lines.append("")
             
             # Get all tables
@@ -1017,36 +1457,52 @@ def sqlite_info(database_path: str) -> str:
                 return "\n".join(result_lines)
                 
             result_lines.append(f"Tables ({len(tables)}):")
-            result_lines.append("="*50)
+            result_lines.append(_SEP50)
+            
+            # Fetch metadata for all tables at once rather than 3 queries per table
+            columns_by_table = {}
+            cursor.execute(
+                "SELECT m.name, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+                "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+                "WHERE m.type='table' ORDER BY m.name, p.cid"
+            )
+            for table_name, *column in cursor.fetchall():
+                columns_by_table.setdefault(table_name, []).append(column)
+            
+            indexes_by_table = {}
+            cursor.execute(
+                "SELECT m.name, i.name, i.\"unique\" "
+                "FROM sqlite_master m JOIN pragma_index_list(m.name) i "
+                "WHERE m.type='table' ORDER BY m.name, i.seq"
+            )
+            for table_name, *index in cursor.fetchall():
+                indexes_by_table.setdefault(table_name, []).append(index)
+            
+            # Use ANALYZE estimates where available - COUNT(*) scans the whole table
+            approx_counts = {} if exact_counts else _approx_row_counts(cursor)
+            row_counts = _count_rows(cursor, [table_name for (table_name,) in tables if table_name not in approx_counts])
             
             for (table_name,) in tables:
                 result_lines.append(f"\nTable: {table_name}")
-                result_lines.append("-" * (7 + len(table_name)))
-                
-                # Get table schema
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = cursor.fetchall()
+                result_lines.append(_dashes(7 + len(table_name)))
                 
                 result_lines.append("Columns:")
-                for col in columns:
-                    cid, name, col_type, notnull, default, pk = col
+                for name, col_type, notnull, default, pk in columns_by_table.get(table_name, []):
                     pk_marker = " (PK)" if pk else ""
                     null_marker = " NOT NULL" if notnull else ""
                     default_marker = f" DEFAULT {default}" if default else ""
                     result_lines.append(f"  {name}: {col_type}{pk_marker}{null_marker}{default_marker}")
                 
-                # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                row_count = cursor.fetchone()[0]
-                result_lines.append(f"Rows: {row_count}")
+                if table_name in approx_counts:
+                    result_lines.append(f"Rows (approx): {approx_counts[table_name]}")
+                else:
+                    result_lines.append(f"Rows: {row_counts[table_name]}")
                 
-                # Get indexes
-                cursor.execute(f"PRAGMA index_list({table_name})")
-                indexes = cursor.fetchall()
+                indexes = indexes_by_table.get(table_name)
                 if indexes:
                     result_lines.append("Indexes:")
-                    for idx in indexes:
-                        result_lines.append(f"  {idx[1]} ({'UNIQUE' if idx[2] else 'NON-UNIQUE'})")
+                    for index_name, unique in indexes:
+                        result_lines.append(f"  {index_name} ({'UNIQUE' if unique else 'NON-UNIQUE'})")
             
             return "\n".join(result_lines)
             
@@ -1063,10 +1519,6 @@ def debug_mcp_connection() -> str:
         Debug information about the server state
     """
     try:
-        import sys
-        import os
-        from pathlib import Path
-        
         info = []
         info.append(f"Python version: {sys.version}")
         info.append(f"Current working directory: {os.getcwd()}")
@@ -1078,8 +1530,9 @@ def debug_mcp_connection() -> str:
         info.append(f"Breathsmith directory exists: {breathsmith_dir.exists()}")
         
         if breathsmith_dir.exists():
-            files = list(breathsmith_dir.glob("*"))
-            info.append(f"Files in breathsmith directory: {[f.name for f in files]}")
+            with os.scandir(breathsmith_dir) as it:
+                names = [entry.name for entry in it]
+            info.append(f"Files in breathsmith directory: {names}")
         
         # Check environment
         has_openai_key = bool(os.getenv("OPENAI_API_KEY"))